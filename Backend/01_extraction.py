@@ -16,8 +16,8 @@ def main():
         """)
 
         # 1. Nodes (Substations & Stations)
-        config.run_step(conn, "Extracting Nodes", """
-            CREATE TABLE gridkit_nodes AS
+        config.run_step(conn, "Extracting Nodes", f"""
+            {config.CREATE_TABLE} gridkit_nodes AS
             SELECT 
                 db_id AS original_id, 
                 type, 
@@ -31,8 +31,8 @@ def main():
         """)
 
         # 2. Towers, Poles, & Inline Equipment
-        config.run_step(conn, "Extracting Towers", """
-            CREATE TABLE gridkit_towers AS
+        config.run_step(conn, "Extracting Towers", f"""
+            {config.CREATE_TABLE} gridkit_towers AS
             SELECT 
                 db_id AS original_id, 
                 type, 
@@ -49,9 +49,18 @@ def main():
             CREATE INDEX idx_towers_geom ON gridkit_towers USING GIST(geom);
         """)
 
+        if config.BULK_BUILD:
+            # Tower/node geometry never changes after extraction, so cluster now for
+            # the S4/S7.5 proximity joins. Trade-off: S8.5 later rewrites the 0V rows
+            # (new row versions land elsewhere), loosening the order for the rest.
+            config.run_step(conn, "Clustering Nodes & Towers on Geometry", """
+                CLUSTER gridkit_nodes USING idx_nodes_geom;
+                CLUSTER gridkit_towers USING idx_towers_geom;
+            """)
+
         # 3. Polygons (Substation Areas)
-        config.run_step(conn, "Extracting Polygons", """
-            CREATE TABLE gridkit_polygons AS
+        config.run_step(conn, "Extracting Polygons", f"""
+            {config.CREATE_TABLE} gridkit_polygons AS
             SELECT 
                 db_id AS original_id, 
                 type, 
@@ -65,8 +74,8 @@ def main():
             CREATE INDEX idx_poly_geom ON gridkit_polygons USING GIST(geom);
         """)
             # 4. Links (Lines)
-        config.run_step(conn, "Extracting Links", """
-            CREATE TABLE gridkit_links AS
+        config.run_step(conn, "Extracting Links", f"""
+            {config.CREATE_TABLE} gridkit_links AS
             SELECT db_id AS original_id, type, COALESCE(voltage,0) AS voltage, 
                    'OSM'::text AS voltage_src, (ST_Dump(geometry)).geom::geometry(LineString,3857) AS geom
             FROM grid_lines;
@@ -101,8 +110,8 @@ def main():
         """)
 
         # 2. Perform the Split
-        config.run_step(conn, "Splitting Geometry", """
-            CREATE TABLE gridkit_links_split AS
+        config.run_step(conn, "Splitting Geometry", f"""
+            {config.CREATE_TABLE} gridkit_links_split AS
             SELECT l.original_id, l.type, l.voltage, l.voltage_src,
                    (ST_Dump(ST_Split(ST_Snap(l.geom, tc.cluster_geom, 1), tc.cluster_geom))).geom::geometry(LineString,3857) AS geom
             FROM gridkit_links l 
@@ -123,21 +132,29 @@ def main():
             ALTER TABLE gridkit_links ADD COLUMN source INTEGER, ADD COLUMN target INTEGER;
             ALTER TABLE gridkit_links ADD COLUMN is_synthetic BOOLEAN DEFAULT FALSE;
             ALTER TABLE gridkit_links ADD COLUMN start_geom geometry(Point,3857), ADD COLUMN end_geom geometry(Point,3857);
-            
-            CREATE INDEX idx_links_geom_final ON gridkit_links USING GIST(geom);
             ANALYZE gridkit_links;
         """)
 
+        # Bulk profile defers link indexes until S4 has finished rewriting geometry.
+        if not config.BULK_BUILD:
+            config.run_step(conn, "Indexing Link Geometry", """
+                CREATE INDEX idx_links_geom_final ON gridkit_links USING GIST(geom);
+            """)
+
         # ---------------------------------------------------------
         # STAGE 3: PRECOMPUTE ENDPOINTS
         # ---------------------------------------------------------
         config.run_step(conn, "S3: Precomputing Endpoints", """
             UPDATE gridkit_links SET start_geom = ST_StartPoint(geom), end_geom = ST_EndPoint(geom);
-            CREATE INDEX idx_start_geom ON gridkit_links USING GIST(start_geom);
-            CREATE INDEX idx_end_geom ON gridkit_links USING GIST(end_geom);
             ANALYZE gridkit_links;
         """)
 
+        if not config.BULK_BUILD:
+            config.run_step(conn, "Indexing Endpoints", """
+                CREATE INDEX idx_start_geom ON gridkit_links USING GIST(start_geom);
+                CREATE INDEX idx_end_geom ON gridkit_links USING GIST(end_geom);
+            """)
+
         # ---------------------------------------------------------
         # STAGE 4: SNAPPING (CRITICAL LOGIC RESTORED)
         # ---------------------------------------------------------
@@ -172,5 +189,15 @@ def main():
             SET geom = ST_SetPoint(ST_SetPoint(geom, 0, start_geom), ST_NPoints(geom)-1, end_geom);
         """)
 
+        if config.BULK_BUILD:
+            # Geometry is final now; S7.5 seeding needs this index. The endpoint
+            # indexes are skipped (no later query reads start_geom/end_geom; the
+            # default profile only keeps them for its old schema), and links are
+            # not CLUSTERed since S5.5 and S9 rewrite every row afterwards.
+            config.run_step(conn, "Indexing Final Link Geometry", """
+                CREATE INDEX idx_links_geom_final ON gridkit_links USING GIST(geom);
+                ANALYZE gridkit_links;
+            """)
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
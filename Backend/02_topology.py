@@ -17,8 +17,8 @@ def main():
             DROP TABLE IF EXISTS gridkit_vertices, gridkit_vertex_degree, transformer_vertices CASCADE;
         """)
 
-        config.run_step(conn, "S5: Creating Unique Vertices", """
-            CREATE TABLE gridkit_vertices AS
+        config.run_step(conn, "S5: Creating Unique Vertices", f"""
+            {config.CREATE_TABLE} gridkit_vertices AS
             SELECT DISTINCT
                 ST_SnapToGrid(pt, 0.001)::geometry(Point,3857) AS the_geom
             FROM (
@@ -32,6 +32,12 @@ def main():
             ANALYZE gridkit_vertices;
         """)
 
+        if config.BULK_BUILD:
+            config.run_step(conn, "S5: Clustering Vertices on Geometry", """
+                CLUSTER gridkit_vertices USING idx_v_geom;
+                ANALYZE gridkit_vertices;
+            """)
+
         # ---------------------------------------------------------
         # STAGE 5.5: MAP LINES TO VERTICES (BATCHED)
         # ---------------------------------------------------------
@@ -83,8 +89,8 @@ def main():
 
         # 1. Vertex Degree (How many lines touch this point?)
         # Useful for finding dead ends (Degree = 1)
-        config.run_step(conn, "Calculating Vertex Degree", """
-            CREATE TABLE gridkit_vertex_degree AS
+        config.run_step(conn, "Calculating Vertex Degree", f"""
+            {config.CREATE_TABLE} gridkit_vertex_degree AS
             SELECT vid, COUNT(*) AS degree
             FROM (
                 SELECT source AS vid FROM gridkit_links
@@ -98,8 +104,8 @@ def main():
         # 2. Transformer Flags
         # We identify which vertices are actually Transformers/Switches
         # This helps the voltage logic know where to stop or start.
-        config.run_step(conn, "Flagging Transformer Nodes", """
-            CREATE TABLE transformer_vertices AS
+        config.run_step(conn, "Flagging Transformer Nodes", f"""
+            {config.CREATE_TABLE} transformer_vertices AS
             SELECT DISTINCT v.id
             FROM gridkit_vertices v
             JOIN gridkit_towers t
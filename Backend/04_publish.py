@@ -6,6 +6,17 @@ def main():
     engine = config.get_engine()
 
     with engine.connect() as conn:
+        # Bulk builds leave UNLOGGED tables behind; make them crash-safe before publishing,
+        # whatever BUILD_PROFILE this script runs under.
+        unlogged = conn.execute(text("""
+            SELECT relname FROM pg_class
+            WHERE relkind = 'r' AND relpersistence = 'u' AND relname = ANY(:tables)
+        """), {"tables": config.WORKING_TABLES}).scalars().all()
+        if unlogged:
+            config.run_step(conn, "S10: Marking Working Tables LOGGED", "".join(
+                f"ALTER TABLE {tbl} SET LOGGED;\n" for tbl in unlogged
+            ))
+
         print(">>> S10: Creating Unified View 'v_grid_final'")
 
         # 2. Create Unified View (All Assets)
@@ -13,18 +24,43 @@ def main():
             DROP MATERIALIZED VIEW IF EXISTS v_grid_final CASCADE;
             
             CREATE MATERIALIZED VIEW v_grid_final AS
-            -- We cast the first geom to geometry(Geometry, 3857) to set the schema for the whole view
-            SELECT id::text AS uid, 'line' AS asset_class, type, voltage, voltage_src, cost, source, target, 
-                   geom::geometry(Geometry, 3857) AS geom FROM gridkit_links
-            UNION ALL
-            SELECT 't_' || original_id::text, 'tower', type, voltage, voltage_src, 0, NULL, NULL, 
-                   geom::geometry(Geometry, 3857) FROM gridkit_towers
-            UNION ALL
-            SELECT 'n_' || original_id::text, 'station', type, voltage, voltage_src, 0, NULL, NULL, 
-                   geom::geometry(Geometry, 3857) FROM gridkit_nodes
-            UNION ALL
-            SELECT 'p_' || original_id::text, 'area', type, voltage, voltage_src, 0, NULL, NULL, 
-                   geom::geometry(Geometry, 3857) FROM gridkit_polygons;
+            SELECT u.*,
+                   -- Small-integer codes shipped in tiles instead of the text columns.
+                   -- Keep in sync with src/constants/grid-codes.js
+                   (CASE u.type
+                        WHEN 'Line' THEN 1 WHEN 'Cable' THEN 2 WHEN 'synthetic' THEN 3
+                        WHEN 'Busbar' THEN 4 WHEN 'Tower' THEN 5 WHEN 'Monopole_HV' THEN 6
+                        WHEN 'Transformer' THEN 7 WHEN 'Compensator' THEN 8 WHEN 'Switch' THEN 9
+                        WHEN 'Circuit Breaker' THEN 10 WHEN 'Disconnector' THEN 11
+                        WHEN 'Substation_Icon' THEN 12 WHEN 'Substation_Area' THEN 13
+                        ELSE 0 END)::smallint AS type_code,
+                   (CASE u.voltage
+                        WHEN 765 THEN 1 WHEN 400 THEN 2 WHEN 220 THEN 3
+                        WHEN 132 THEN 4 WHEN 110 THEN 5 WHEN 66 THEN 6
+                        ELSE 0 END)::smallint AS volt_code,
+                   (CASE
+                        WHEN u.type = 'synthetic' OR u.voltage_src = 'Synthetic' THEN 5
+                        WHEN u.voltage_src = 'Inferred-from-Node' THEN 1
+                        WHEN u.voltage_src = 'Inferred-from-Tower' THEN 2
+                        WHEN u.voltage_src = 'Inferred-from-Line' THEN 3
+                        WHEN u.voltage_src = 'Graph-Inferred' THEN 4
+                        ELSE 0 END)::smallint AS src_code
+            FROM (
+                -- We cast the first geom to geometry(Geometry, 3857) to set the schema for the whole view.
+                -- fid is the tile feature id, set for lines only (the power-lines offset alternates on it);
+                -- ST_AsMVT leaves the id unset for NULL, so other assets carry no id bytes.
+                SELECT id::text AS uid, id::bigint AS fid, 'line' AS asset_class, type, voltage, voltage_src, cost, source, target, 
+                       geom::geometry(Geometry, 3857) AS geom FROM gridkit_links
+                UNION ALL
+                SELECT 't_' || original_id::text, NULL, 'tower', type, voltage, voltage_src, 0, NULL, NULL, 
+                       geom::geometry(Geometry, 3857) FROM gridkit_towers
+                UNION ALL
+                SELECT 'n_' || original_id::text, NULL, 'station', type, voltage, voltage_src, 0, NULL, NULL, 
+                       geom::geometry(Geometry, 3857) FROM gridkit_nodes
+                UNION ALL
+                SELECT 'p_' || original_id::text, NULL, 'area', type, voltage, voltage_src, 0, NULL, NULL, 
+                       geom::geometry(Geometry, 3857) FROM gridkit_polygons
+            ) u;
 
             -- 1. Create the spatial index
             CREATE INDEX idx_v_grid_final_geom ON v_grid_final USING GIST(geom);
@@ -32,6 +68,38 @@ def main():
             -- 2. FORCE REGISTRATION: This makes it visible to pg_tileserv's metadata crawler
             SELECT populate_geometry_columns('public.v_grid_final'::regclass);
         """)
+
+        # Function layer for pg_tileserv: filters arrive as comma-separated code lists
+        # (?types=1,2,3&volts=1,2&srcs=0,5) so tiles only carry what the sidebar shows.
+        # Voltage/provenance filters apply to lines & busbars (type codes 1-4) only.
+        config.run_step(conn, "Creating Filtered Tile Function 'grid_tiles'", """
+            CREATE OR REPLACE FUNCTION public.grid_tiles(
+                z integer, x integer, y integer,
+                types text DEFAULT '0,1,2,3,4,5,6,7,8,9,10,11,12,13',
+                volts text DEFAULT '0,1,2,3,4,5,6',
+                srcs  text DEFAULT '0,1,2,3,4,5')
+            RETURNS bytea AS $$
+                WITH bounds AS (
+                    SELECT ST_TileEnvelope(z, x, y) AS geom,
+                           string_to_array(types, ',')::smallint[] AS ta,
+                           string_to_array(volts, ',')::smallint[] AS va,
+                           string_to_array(srcs, ',')::smallint[] AS sa
+                ),
+                mvtgeom AS (
+                    SELECT ST_AsMVTGeom(v.geom, b.geom) AS geom,
+                           v.fid, v.type_code AS t, v.volt_code AS vc, v.src_code AS s, v.voltage
+                    FROM v_grid_final v, bounds b
+                    WHERE v.geom && b.geom
+                      AND v.type_code = ANY(b.ta)
+                      AND (v.type_code NOT BETWEEN 1 AND 4
+                           OR (v.volt_code = ANY(b.va) AND v.src_code = ANY(b.sa)))
+                )
+                SELECT ST_AsMVT(mvtgeom, 'public.grid_tiles', 4096, 'geom', 'fid') FROM mvtgeom;
+            $$ LANGUAGE sql STABLE PARALLEL SAFE;
+
+            COMMENT ON FUNCTION public.grid_tiles IS
+                'Grid assets filtered by type/voltage/source codes (see src/constants/grid-codes.js).';
+        """)
         # ---------------------------------------------------------
         # FINAL AUDIT REPORT
         # ---------------------------------------------------------
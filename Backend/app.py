@@ -1,5 +1,7 @@
 import subprocess
 import time
+import config
+from sqlalchemy import text
 
 PIPELINE = [
     "01_extraction.py",   # Creates initial tables from raw OSM, only needed if decided to restart.
@@ -8,17 +10,38 @@ PIPELINE = [
     "04_publish.py"       # Updates Views
 ]
 
+def current_wal_lsn(engine):
+    # Cluster-wide WAL position; compare runs of each BUILD_PROFILE on an otherwise idle server.
+    with engine.connect() as conn:
+        return conn.execute(text("SELECT pg_current_wal_lsn()")).scalar()
+
+def wal_bytes_since(engine, lsn):
+    with engine.connect() as conn:
+        return conn.execute(text("SELECT pg_wal_lsn_diff(pg_current_wal_lsn(), :lsn)"), {"lsn": lsn}).scalar()
+
 def main():
     print("████████ GRID SURGEON MASTER PIPELINE ████████")
+    print(f"BUILD_PROFILE: {config.BUILD_PROFILE}")
+    engine = config.get_engine()
     total_start = time.time()
+    total_lsn = current_wal_lsn(engine)
+    timings = []
 
     for script in PIPELINE:
         print(f"\n LAUNCHING: {script}")
+        start, lsn = time.time(), current_wal_lsn(engine)
         try:
             subprocess.run(["python", script], check=True)
         except subprocess.CalledProcessError:
             print(f"\n CRITICAL FAILURE in {script}. Pipeline halted.")
             exit(1)
+        timings.append((script, time.time() - start, wal_bytes_since(engine, lsn)))
+
+    print("\n BUILD COST PER STAGE")
+    for script, elapsed, wal in timings:
+        print(f"    - {script:<18}: {elapsed/60:6.1f} min | WAL {wal/1024**2:10,.1f} MB")
+    print(f"    - {'TOTAL':<18}: {(time.time()-total_start)/60:6.1f} min | "
+          f"WAL {wal_bytes_since(engine, total_lsn)/1024**2:10,.1f} MB")
 
     print(f"\n ALL SYSTEMS GO. Total Time: {(time.time()-total_start)/60:.1f} min ✨")
 
@@ -12,12 +12,39 @@ DB_USER     = os.getenv("DB_USER", "postgres")
 DB_HOST     = os.getenv("DB_HOST", "localhost")
 BATCH_SIZE  = 75000 
 
+# Build profile: "default" (logged tables, stock session) or "bulk"
+# (UNLOGGED working tables, deferred indexes + CLUSTER, tuned sessions).
+BUILD_PROFILE = os.getenv("BUILD_PROFILE", "default").strip().lower()
+if BUILD_PROFILE not in ("default", "bulk"):
+    raise ValueError(f"Unknown BUILD_PROFILE '{BUILD_PROFILE}' (expected 'default' or 'bulk')")
+BULK_BUILD    = BUILD_PROFILE == "bulk"
+CREATE_TABLE  = "CREATE UNLOGGED TABLE" if BULK_BUILD else "CREATE TABLE"
+
+# Per-session settings applied to every connection in the bulk profile.
+BULK_SESSION_SETTINGS = {
+    "work_mem": "256MB",
+    "maintenance_work_mem": "1GB",
+    "max_parallel_workers_per_gather": "4",
+    "max_parallel_maintenance_workers": "4",
+    "synchronous_commit": "off",
+}
+
+# Working tables switched back to LOGGED (if needed) when the grid is published.
+WORKING_TABLES = [
+    "gridkit_nodes", "gridkit_towers", "gridkit_polygons", "gridkit_links",
+    "gridkit_vertices", "gridkit_vertex_degree", "transformer_vertices",
+]
+
 def get_engine():
     if not DB_PASSWORD:
         raise ValueError("DB_PASSWORD not found in .env file!")
         
     db_url = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
-    return create_engine(db_url, future=True)
+    connect_args = {}
+    if BULK_BUILD:
+        options = " ".join(f"-c {k}={v}" for k, v in BULK_SESSION_SETTINGS.items())
+        connect_args["options"] = options
+    return create_engine(db_url, future=True, connect_args=connect_args)
 
 
 def run_step(conn, title, sql, params=None):
@@ -2,7 +2,8 @@ import React, { useRef, useEffect, useState } from 'react';
 import maplibregl from 'maplibre-gl';
 import 'maplibre-gl/dist/maplibre-gl.css';
 import { SVGS, loadSvgIcon } from '../constants/grid-icons';
-import { addMapLayers, applyFilters } from '../constants/map-layers';
+import { addMapLayers, applyFilters, buildTileUrl } from '../constants/map-layers';
+import { TYPE_NAMES, SRC_NAMES, SRC_CODES } from '../constants/grid-codes';
 
 const GridMap = ({ filters, onMapLoad }) => {
     const mapContainer = useRef(null);
@@ -39,10 +40,10 @@ const GridMap = ({ filters, onMapLoad }) => {
         map.on("load", async () => {
             console.log("Base Map Loaded. Injecting Grid Data...");
 
-            // A. Add Vector Source
+            // A. Add Vector Source (filtered server-side by the grid_tiles function)
             map.addSource("grid", {
                 type: "vector",
-                tiles: ["http://localhost:7800/public.v_grid_final/{z}/{x}/{y}.pbf"],
+                tiles: [buildTileUrl(filters)],
                 minzoom: 0,
                 maxzoom: 14
             });
@@ -148,11 +149,12 @@ function setupInteractions(map) {
 
         // --- DEFINE DATA VARIABLES ---
         const title = (p.name || p.official_name || 'Unnamed Asset');
-        const assetType = (p.type || 'Asset').replace('_', ' ').toUpperCase();
+        const isSynthetic = p.s === SRC_CODES.Synthetic;
+        const assetType = (TYPE_NAMES[p.t] || 'Asset').replace('_', ' ').toUpperCase();
         const voltage = p.voltage && p.voltage > 0 ? `${p.voltage} kV` : 'Unknown Voltage';
         
-        let sourceTag = p.voltage_src || 'Unknown';
-        if (p.is_synthetic) sourceTag = 'Synthetic Bridge';
+        let sourceTag = SRC_NAMES[p.s] || 'Unknown';
+        if (isSynthetic) sourceTag = 'Synthetic Bridge';
 
         // --- FIX: DEFINE THE URL HERE ---
         const googleMapsUrl = `https://www.google.com/maps?q=${lat},${lng}`;
@@ -165,7 +167,7 @@ function setupInteractions(map) {
                 </div>
                 <div style="padding:10px;font-size:13px;line-height:1.5">
                     <div><b>Voltage:</b> ${voltage}</div>
-                    <div><b>Source:</b> <span style="color:${p.is_synthetic ? '#ff00d4' : '#000'}">${sourceTag}</span></div>
+                    <div><b>Source:</b> <span style="color:${isSynthetic ? '#ff00d4' : '#000'}">${sourceTag}</span></div>
                     
                     <div style="margin-top:8px; padding-top:8px; border-top:1px solid #eee; display:flex; justify-content:space-between; align-items:center">
                         <div style="font-size:11px;color:#666">
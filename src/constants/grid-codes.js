@@ -0,0 +1,44 @@
+// constants/grid-codes.js
+// Small-integer codes emitted by the `public.grid_tiles` function layer.
+// Keep in sync with the CASE expressions in Backend/04_publish.py.
+
+export const TYPE_CODES = {
+    'Other': 0,
+    'Line': 1,
+    'Cable': 2,
+    'synthetic': 3,
+    'Busbar': 4,
+    'Tower': 5,
+    'Monopole_HV': 6,
+    'Transformer': 7,
+    'Compensator': 8,
+    'Switch': 9,
+    'Circuit Breaker': 10,
+    'Disconnector': 11,
+    'Substation_Icon': 12,
+    'Substation_Area': 13
+};
+
+// 0 = any non-standard / unknown voltage
+export const VOLT_CODES = {
+    'Low/Unknown': 0,
+    '765': 1,
+    '400': 2,
+    '220': 3,
+    '132': 4,
+    '110': 5,
+    '66': 6
+};
+
+export const SRC_CODES = {
+    'OSM': 0,
+    'Inferred-from-Node': 1,
+    'Inferred-from-Tower': 2,
+    'Inferred-from-Line': 3,
+    'Graph-Inferred': 4,
+    'Synthetic': 5
+};
+
+// Reverse lookups for popups
+export const TYPE_NAMES = Object.fromEntries(Object.entries(TYPE_CODES).map(([k, v]) => [v, k]));
+export const SRC_NAMES = Object.fromEntries(Object.entries(SRC_CODES).map(([k, v]) => [v, k]));
@@ -1,6 +1,8 @@
 // constants/map-layers.jsx
+import { TYPE_CODES as T, VOLT_CODES, SRC_CODES } from './grid-codes';
 
-const SOURCE_LAYER = 'public.v_grid_final'; 
+const TILE_URL = 'http://localhost:7800/public.grid_tiles/{z}/{x}/{y}.pbf';
+const SOURCE_LAYER = 'public.grid_tiles'; 
 
 export function addMapLayers(map) {
     
@@ -12,7 +14,7 @@ export function addMapLayers(map) {
         type: 'fill',
         source: 'grid',
         'source-layer': SOURCE_LAYER,
-        filter: ['==', ['get', 'type'], 'Substation_Area'], 
+        filter: ['==', ['get', 't'], T.Substation_Area], 
         paint: { 'fill-color': '#c0c0c0', 'fill-opacity': 0.6 }
     });
     
@@ -21,7 +23,7 @@ export function addMapLayers(map) {
         type: 'line',
         source: 'grid',
         'source-layer': SOURCE_LAYER,
-        filter: ['==', ['get', 'type'], 'Substation_Area'], 
+        filter: ['==', ['get', 't'], T.Substation_Area], 
         paint: { 'line-color': '#666', 'line-width': 1, 'line-opacity': 0.8 }
     });
 
@@ -33,7 +35,7 @@ export function addMapLayers(map) {
         type: 'line',
         source: 'grid',
         'source-layer': SOURCE_LAYER,
-        filter: ['==', ['get', 'type'], 'Busbar'], 
+        filter: ['==', ['get', 't'], T.Busbar], 
         minzoom: 11,
         paint: {
             'line-color': '#333',
@@ -50,25 +52,25 @@ export function addMapLayers(map) {
         source: 'grid',
         'source-layer': SOURCE_LAYER,
         // Broad filter to catch Line, Synthetic, Cable, AND anything else that acts as a line
-        filter: ['match', ['get', 'type'], ['Line', 'synthetic', 'Cable'], true, false], 
+        filter: ['match', ['get', 't'], [T.Line, T.synthetic, T.Cable], true, false], 
         paint: {
             'line-color': [
                 'case',
                 // Priority 1: Synthetic (Pink)
-                ['==', ['get', 'type'], 'synthetic'], '#ff00d4',
-                ['==', ['get', 'is_synthetic'], true], '#ff00d4',
+                ['==', ['get', 't'], T.synthetic], '#ff00d4',
+                ['==', ['get', 's'], SRC_CODES.Synthetic], '#ff00d4',
 
                 // Priority 2: Underground Cables (Dark Grey)
-                ['==', ['get', 'type'], 'Cable'], '#555',
+                ['==', ['get', 't'], T.Cable], '#555',
 
                 // Priority 3: STANDARD VOLTAGES
-                ['match', ['to-string', ['get', 'voltage']],
-                    '765', '#6a0dad', 
-                    '400', '#b30000', 
-                    '220', '#ff8c00', 
-                    '132', '#006400', 
-                    '110', '#32CD32', 
-                    '66',  '#0000FF', 
+                ['match', ['get', 'vc'],
+                    VOLT_CODES['765'], '#6a0dad', 
+                    VOLT_CODES['400'], '#b30000', 
+                    VOLT_CODES['220'], '#ff8c00', 
+                    VOLT_CODES['132'], '#006400', 
+                    VOLT_CODES['110'], '#32CD32', 
+                    VOLT_CODES['66'],  '#0000FF', 
                     '#999' 
                 ]
             ],
@@ -78,6 +80,8 @@ export function addMapLayers(map) {
                 8, 2, 
                 14, 4 
             ],
+            // grid_tiles sends line ids, so parallel lines alternate +/-1.5 px
+            // (the old v_grid_final layer had no ids and offset every line +1.5).
             'line-offset': [
                 'case', 
                 ['==', ['%', ['to-number', ['coalesce', ['id'], 0]], 2], 0], 
@@ -93,9 +97,9 @@ export function addMapLayers(map) {
                 ['literal', [1, 0]], 7, 
                 [
                     'case',
-                    ['==', ['get', 'type'], 'synthetic'], ['literal', [2, 2]], 
-                    ['==', ['get', 'type'], 'Cable'], ['literal', [3, 2]],
-                    ['!=', ['get', 'voltage_src'], 'OSM'], ['literal', [3, 1]], 
+                    ['==', ['get', 't'], T.synthetic], ['literal', [2, 2]], 
+                    ['==', ['get', 't'], T.Cable], ['literal', [3, 2]],
+                    ['!=', ['get', 's'], SRC_CODES.OSM], ['literal', [3, 1]], 
                     ['literal', [1, 0]]
                 ]
             ]
@@ -110,7 +114,7 @@ export function addMapLayers(map) {
         type: 'circle',
         source: 'grid',
         'source-layer': SOURCE_LAYER,
-        filter: ['match', ['get', 'type'], ['Switch', 'Circuit Breaker', 'Disconnector'], true, false],
+        filter: ['match', ['get', 't'], [T.Switch, T['Circuit Breaker'], T.Disconnector], true, false],
         minzoom: 13,
         paint: { 'circle-radius': 3, 'circle-color': '#fff', 'circle-stroke-width': 1, 'circle-stroke-color': '#000' }
     });
@@ -120,7 +124,7 @@ export function addMapLayers(map) {
         type: 'circle',
         source: 'grid',
         'source-layer': SOURCE_LAYER,
-        filter: ['==', ['get', 'type'], 'Monopole_HV'],
+        filter: ['==', ['get', 't'], T.Monopole_HV],
         minzoom: 11,
         paint: { 'circle-radius': 3, 'circle-color': '#444', 'circle-stroke-width': 1, 'circle-stroke-color': '#fff' }
     });
@@ -141,7 +145,7 @@ export function addMapLayers(map) {
             type: 'symbol',
             source: 'grid',
             'source-layer': SOURCE_LAYER,
-            filter: ['==', ['get', 'type'], l.type], 
+            filter: ['==', ['get', 't'], T[l.type]], 
             minzoom: l.minz,
             layout: {
                 'visibility': 'visible',
@@ -151,91 +155,72 @@ export function addMapLayers(map) {
                 'icon-ignore-placement': true 
             },
             paint: {
-                'icon-opacity': ['case', ['==', ['get', 'voltage_src'], 'OSM'], 1.0, 0.8]
+                'icon-opacity': ['case', ['==', ['get', 's'], SRC_CODES.OSM], 1.0, 0.8]
             }
         });
     });
 }
 
 
-export function applyFilters(map, filters) {
-    if (!map || !filters) return;
+// Filtering happens in the `grid_tiles` function on the server: the sidebar
+// state is turned into code lists and passed as tile URL parameters.
+export function buildTileUrl(filters) {
+    if (!filters) return TILE_URL;
 
+    // 1. VOLTAGE FILTER (lines & busbars only)
     const highVoltages = ['765', '400', '220', '132', '110', '66'];
-    const activeHighVolts = highVoltages.filter(v => filters[v]);
-    
-    const showOther = filters['Other / Distribution'] || filters['Other'] || filters['Distribution'] || filters['Low/Unknown'];
-
-    const voltageFilter = ['any'];
-
-    if (activeHighVolts.length > 0) {
-        voltageFilter.push(['match', ['to-string', ['get', 'voltage']], activeHighVolts, true, false]);
-    }
-
-    if (showOther) {
-        voltageFilter.push([
-            '!', 
-            ['match', ['to-string', ['get', 'voltage']], highVoltages, true, false]
-        ]);
-    }
-
-    const finalVoltFilter = voltageFilter.length > 1 ? voltageFilter : ['==', '1', '0'];
+    const volts = highVoltages.filter(v => filters[v]).map(v => VOLT_CODES[v]);
 
+    const showOther = filters['Other / Distribution'] || filters['Other'] || filters['Distribution'] || filters['Low/Unknown'];
+    if (showOther) volts.push(VOLT_CODES['Low/Unknown']);
 
-    // 2. TRUST FILTER
-    const trustConditions = ['any'];
+    // 2. TRUST FILTER (lines & busbars only)
+    const srcs = [];
     if (filters['Authoritative (OSM)'] || filters['OSM']) {
-        trustConditions.push([
-            'any',
-            ['==', ['get', 'voltage_src'], 'OSM'],
-            ['!', ['has', 'voltage_src']], 
-            ['==', ['get', 'voltage_src'], null]
-        ]);
+        srcs.push(SRC_CODES.OSM);
     }
     if (filters['Inferred (GridVision)'] || filters['Inferred']) {
-        trustConditions.push(['match', ['get', 'voltage_src'], ['Graph-Inferred', 'Inferred-from-Line', 'Inferred-from-Node'], true, false]);
+        srcs.push(SRC_CODES['Inferred-from-Node'], SRC_CODES['Inferred-from-Tower'],
+                  SRC_CODES['Inferred-from-Line'], SRC_CODES['Graph-Inferred']);
     }
     if (filters['Synthetic Bridges'] || filters['Synthetic']) {
-        trustConditions.push([
-            'any',
-            ['==', ['get', 'is_synthetic'], true],
-            ['==', ['get', 'type'], 'synthetic']
-        ]);
+        srcs.push(SRC_CODES.Synthetic);
     }
-    const finalTrustFilter = trustConditions.length > 1 ? trustConditions : ['==', '1', '0'];
-
 
-    // 3. APPLY TO POWER LINES & BUSBARS
-    const finalFilter = ['all', finalVoltFilter, finalTrustFilter];
-
-    if (map.getLayer('power-lines')) {
-        map.setFilter('power-lines', ['all', ['match', ['get', 'type'], ['Line', 'Cable', 'synthetic'], true, false], finalFilter]);
-    }
-    if (map.getLayer('busbars')) {
-        map.setFilter('busbars', ['all', ['match', ['get', 'type'], ['Busbar'], true, false], finalFilter]);
-    }
-
-    // 4. LAYER VISIBILITY
+    // 3. ASSET TYPES (only what a visible layer will draw)
     const assetMap = {
-        'Tower': 'towers',
-        'Monopole_HV': 'monopoles',
-        'Transformer': 'transformers',
-        'Compensator': 'compensators',
-        'Switch': 'switches',
-        'Cable': 'cables',
-        'Substation_Icon': ['substations', 'substations-fill', 'substations-outline']
+        'Tower': [T.Tower],
+        'Monopole_HV': [T.Monopole_HV],
+        'Transformer': [T.Transformer],
+        'Compensator': [T.Compensator],
+        'Switch': [T.Switch, T['Circuit Breaker'], T.Disconnector],
+        'Cable': [T.Cable],
+        'Busbar': [T.Busbar],
+        'Substation_Icon': [T.Substation_Icon, T.Substation_Area]
     };
 
+    const types = [T.Line, T.synthetic];
     Object.keys(assetMap).forEach(key => {
-        const isVisible = (filters[key] !== false); 
-        const visibility = isVisible ? 'visible' : 'none';
-        
-        const layers = Array.isArray(assetMap[key]) ? assetMap[key] : [assetMap[key]];
-        
-        layers.forEach(layerId => {
-            if (map.getLayer(layerId)) {
-                map.setLayoutProperty(layerId, 'visibility', visibility);
-            }
-        });
+        if (filters[key] !== false) types.push(...assetMap[key]);
     });
-}
\ No newline at end of file
+
+    const params = new URLSearchParams({
+        types: types.join(','),
+        volts: volts.join(','),
+        srcs: srcs.join(',')
+    });
+    return `${TILE_URL}?${params.toString().replace(/%2C/g, ',')}`;
+}
+
+
+export function applyFilters(map, filters) {
+    if (!map || !filters) return;
+
+    const source = map.getSource('grid');
+    if (!source) return;
+
+    const url = buildTileUrl(filters);
+    if (source.tiles && source.tiles[0] === url) return;
+
+    source.setTiles([url]);
+}